@@ -7,14 +7,16 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import partial
 from utils import (
-    load_data, 
-    clean_data, 
+    load_and_clean,
     filter_data, 
     calculate_kpis,
-    get_satisfaction_by_group,
-    get_resolution_by_group,
-    get_volume_by_group
+    compute_all_aggregates,
+    get_filter_options,
+    sample_by_group,
+    to_csv_bytes,
+    to_parquet_bytes
 )
 
 
@@ -79,12 +81,112 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# ============================================================================
+# CHART HELPERS
+# ============================================================================
+
+# Figures are cached on their (small) input frames, so reruns that don't
+# change a chart's data reuse the already-built figure. Each cache is bounded
+# because every filter combination tried on a shared server adds an entry
+
+
+@st.cache_data(max_entries=32)
+def _metric_bar_fig(agg_df, x, y, color_scale, text_format, xaxis_title, yaxis_title):
+    """Bar chart of an averaged metric per group, coloured by the metric."""
+    fig = px.bar(
+        agg_df,
+        x=x,
+        y=y,
+        text=y,
+        color=y,
+        color_continuous_scale=color_scale,
+        hover_data={"Count": True}
+    )
+    fig.update_traces(texttemplate=text_format, textposition='outside')
+    fig.update_layout(
+        showlegend=False,
+        height=400,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        autosize=True,
+        margin=dict(l=20, r=20, t=40, b=80),
+        font=dict(size=11)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=8)
+def _scatter_fig(df_scatter):
+    """Resolution time vs satisfaction scatter, coloured by priority."""
+    fig = px.scatter(
+        df_scatter,
+        x="Time to Resolution",
+        y="Customer Satisfaction Rating",
+        color="Ticket Priority",
+        # A single hover column keeps the per-point figure payload small
+        hover_data=["Ticket Status"],
+        opacity=0.6,
+        render_mode="webgl"
+    )
+    fig.update_layout(
+        height=400,
+        xaxis_title="Time to Resolution (hours)",
+        yaxis_title="Satisfaction Rating",
+        autosize=True,
+        margin=dict(l=20, r=20, t=40, b=80),
+        font=dict(size=11)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=16)
+def _volume_pie_fig(agg_df, names):
+    """Donut chart of ticket counts per group."""
+    fig = px.pie(
+        agg_df,
+        names=names,
+        values="Count",
+        hole=0.4
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        height=400,
+        autosize=True,
+        margin=dict(l=20, r=20, t=40, b=20),
+        font=dict(size=11)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=16)
+def _volume_bar_fig(agg_df, x, xaxis_title):
+    """Bar chart of ticket counts per group."""
+    fig = px.bar(
+        agg_df,
+        x=x,
+        y="Count",
+        text="Count",
+        color=x
+    )
+    fig.update_traces(textposition='outside')
+    fig.update_layout(
+        showlegend=False,
+        height=400,
+        xaxis_title=xaxis_title,
+        yaxis_title="Number of Tickets",
+        autosize=True,
+        margin=dict(l=20, r=20, t=40, b=80),
+        font=dict(size=11)
+    )
+    return fig
+
+
 # ============================================================================
 # LOAD AND CLEAN DATA
 # ============================================================================
 
-df_raw = load_data()
-df = clean_data(df_raw)
+df = load_and_clean()
+filter_options = get_filter_options(df)
 
 
 # ============================================================================
@@ -118,7 +220,7 @@ else:
 
 # Priority Filter
 st.sidebar.subheader("⚡ Priority")
-all_priorities = df["Ticket Priority"].dropna().unique().tolist()
+all_priorities = filter_options["Ticket Priority"]
 selected_priorities = st.sidebar.multiselect(
     "Select Priorities",
     options=all_priorities,
@@ -128,7 +230,7 @@ selected_priorities = st.sidebar.multiselect(
 
 # Channel Filter
 st.sidebar.subheader("📞 Channel")
-all_channels = df["Ticket Channel"].dropna().unique().tolist()
+all_channels = filter_options["Ticket Channel"]
 selected_channels = st.sidebar.multiselect(
     "Select Channels",
     options=all_channels,
@@ -138,7 +240,7 @@ selected_channels = st.sidebar.multiselect(
 
 # Status Filter
 st.sidebar.subheader("📊 Status")
-all_statuses = df["Ticket Status"].dropna().unique().tolist()
+all_statuses = filter_options["Ticket Status"]
 selected_statuses = st.sidebar.multiselect(
     "Select Statuses",
     options=all_statuses,
@@ -148,7 +250,7 @@ selected_statuses = st.sidebar.multiselect(
 
 # Product Filter
 st.sidebar.subheader("🛍️ Product")
-all_products = df["Product Purchased"].dropna().unique().tolist()
+all_products = filter_options["Product Purchased"]
 selected_products = st.sidebar.multiselect(
     "Select Products",
     options=all_products,
@@ -170,6 +272,17 @@ df_filtered = filter_data(
     products=selected_products
 )
 
+# Grouped chart data is cached per filter selection. Selections are sorted
+# so the same set picked in a different order reuses the cached entry
+filter_key = (
+    selected_date_range,
+    tuple(sorted(selected_priorities)),
+    tuple(sorted(selected_channels)),
+    tuple(sorted(selected_statuses)),
+    tuple(sorted(selected_products))
+)
+aggregates = compute_all_aggregates(df_filtered, filter_key)
+
 
 # ============================================================================
 # HEADER
@@ -227,27 +340,17 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("By Ticket Type")
-    sat_by_type = get_satisfaction_by_group(df_filtered, "Ticket Type")
+    sat_by_type = aggregates["sat_by_type"]
     
     if not sat_by_type.empty:
-        fig_type = px.bar(
+        fig_type = _metric_bar_fig(
             sat_by_type,
             x="Ticket Type",
             y="Average Satisfaction",
-            text="Average Satisfaction",
-            color="Average Satisfaction",
-            color_continuous_scale="RdYlGn",
-            hover_data={"Count": True}
-        )
-        fig_type.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-        fig_type.update_layout(
-            showlegend=False,
-            height=400,
+            color_scale="RdYlGn",
+            text_format='%{text:.2f}',
             xaxis_title="Ticket Type",
-            yaxis_title="Average Satisfaction Rating",
-            autosize=True,
-            margin=dict(l=20, r=20, t=40, b=80),
-            font=dict(size=11)
+            yaxis_title="Average Satisfaction Rating"
         )
         st.plotly_chart(fig_type, use_container_width=True)
     else:
@@ -255,27 +358,17 @@ with col1:
 
 with col2:
     st.subheader("By Priority")
-    sat_by_priority = get_satisfaction_by_group(df_filtered, "Ticket Priority")
+    sat_by_priority = aggregates["sat_by_priority"]
     
     if not sat_by_priority.empty:
-        fig_priority = px.bar(
+        fig_priority = _metric_bar_fig(
             sat_by_priority,
             x="Ticket Priority",
             y="Average Satisfaction",
-            text="Average Satisfaction",
-            color="Average Satisfaction",
-            color_continuous_scale="RdYlGn",
-            hover_data={"Count": True}
-        )
-        fig_priority.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-        fig_priority.update_layout(
-            showlegend=False,
-            height=400,
+            color_scale="RdYlGn",
+            text_format='%{text:.2f}',
             xaxis_title="Ticket Priority",
-            yaxis_title="Average Satisfaction Rating",
-            autosize=True,
-            margin=dict(l=20, r=20, t=40, b=80),
-            font=dict(size=11)
+            yaxis_title="Average Satisfaction Rating"
         )
         st.plotly_chart(fig_priority, use_container_width=True)
     else:
@@ -283,27 +376,17 @@ with col2:
 
 # Satisfaction by Channel
 st.subheader("By Channel")
-sat_by_channel = get_satisfaction_by_group(df_filtered, "Ticket Channel")
+sat_by_channel = aggregates["sat_by_channel"]
 
 if not sat_by_channel.empty:
-    fig_channel = px.bar(
+    fig_channel = _metric_bar_fig(
         sat_by_channel,
         x="Ticket Channel",
         y="Average Satisfaction",
-        text="Average Satisfaction",
-        color="Average Satisfaction",
-        color_continuous_scale="RdYlGn",
-        hover_data={"Count": True}
-    )
-    fig_channel.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-    fig_channel.update_layout(
-        showlegend=False,
-        height=400,
+        color_scale="RdYlGn",
+        text_format='%{text:.2f}',
         xaxis_title="Support Channel",
-        yaxis_title="Average Satisfaction Rating",
-        autosize=True,
-        margin=dict(l=20, r=20, t=40, b=80),
-        font=dict(size=11)
+        yaxis_title="Average Satisfaction Rating"
     )
     st.plotly_chart(fig_channel, use_container_width=True)
 else:
@@ -331,21 +414,14 @@ with col1:
     ]
     
     if not df_scatter.empty:
-        fig_scatter = px.scatter(
-            df_scatter,
-            x="Time to Resolution",
-            y="Customer Satisfaction Rating",
-            color="Ticket Priority",
-            hover_data=["Ticket Status", "Ticket Channel", "Product Purchased"],
-            opacity=0.6
-        )
-        fig_scatter.update_layout(
-            height=400,
-            xaxis_title="Time to Resolution (hours)",
-            yaxis_title="Satisfaction Rating",
-            autosize=True,
-            margin=dict(l=20, r=20, t=40, b=80),
-            font=dict(size=11)
+        # Plot a stratified sample so the browser isn't drawing every ticket
+        df_scatter = sample_by_group(df_scatter, "Ticket Priority")
+        
+        fig_scatter = _scatter_fig(
+            df_scatter[[
+                "Time to Resolution", "Customer Satisfaction Rating",
+                "Ticket Priority", "Ticket Status"
+            ]]
         )
         st.plotly_chart(fig_scatter, use_container_width=True)
     else:
@@ -353,27 +429,17 @@ with col1:
 
 with col2:
     st.subheader("Avg Resolution Time by Priority")
-    res_by_priority = get_resolution_by_group(df_filtered, "Ticket Priority")
+    res_by_priority = aggregates["res_by_priority"]
     
     if not res_by_priority.empty:
-        fig_res_priority = px.bar(
+        fig_res_priority = _metric_bar_fig(
             res_by_priority,
             x="Ticket Priority",
             y="Average Resolution Time",
-            text="Average Resolution Time",
-            color="Average Resolution Time",
-            color_continuous_scale="Reds_r",
-            hover_data={"Count": True}
-        )
-        fig_res_priority.update_traces(texttemplate='%{text:.1f}h', textposition='outside')
-        fig_res_priority.update_layout(
-            showlegend=False,
-            height=400,
+            color_scale="Reds_r",
+            text_format='%{text:.1f}h',
             xaxis_title="Ticket Priority",
-            yaxis_title="Average Resolution Time (hours)",
-            autosize=True,
-            margin=dict(l=20, r=20, t=40, b=80),
-            font=dict(size=11)
+            yaxis_title="Average Resolution Time (hours)"
         )
         st.plotly_chart(fig_res_priority, use_container_width=True)
     else:
@@ -392,47 +458,23 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Ticket Volume by Channel")
-    vol_by_channel = get_volume_by_group(df_filtered, "Ticket Channel")
+    vol_by_channel = aggregates["vol_by_channel"]
     
     if not vol_by_channel.empty:
-        fig_vol_channel = px.pie(
-            vol_by_channel,
-            names="Ticket Channel",
-            values="Count",
-            hole=0.4
-        )
-        fig_vol_channel.update_traces(textposition='inside', textinfo='percent+label')
-        fig_vol_channel.update_layout(
-            height=400,
-            autosize=True,
-            margin=dict(l=20, r=20, t=40, b=20),
-            font=dict(size=11)
-        )
+        fig_vol_channel = _volume_pie_fig(vol_by_channel, names="Ticket Channel")
         st.plotly_chart(fig_vol_channel, use_container_width=True)
     else:
         st.info("No channel data available")
 
 with col2:
     st.subheader("Ticket Volume by Status")
-    vol_by_status = get_volume_by_group(df_filtered, "Ticket Status")
+    vol_by_status = aggregates["vol_by_status"]
     
     if not vol_by_status.empty:
-        fig_vol_status = px.bar(
+        fig_vol_status = _volume_bar_fig(
             vol_by_status,
             x="Ticket Status",
-            y="Count",
-            text="Count",
-            color="Ticket Status"
-        )
-        fig_vol_status.update_traces(textposition='outside')
-        fig_vol_status.update_layout(
-            showlegend=False,
-            height=400,
-            xaxis_title="Status",
-            yaxis_title="Number of Tickets",
-            autosize=True,
-            margin=dict(l=20, r=20, t=40, b=80),
-            font=dict(size=11)
+            xaxis_title="Status"
         )
         st.plotly_chart(fig_vol_status, use_container_width=True)
     else:
@@ -465,14 +507,21 @@ with st.expander("🔍 Data Explorer - View Filtered Data"):
         height=400
     )
     
-    # Download button
-    csv = df_filtered.to_csv(index=False)
+    # Download buttons - files are only generated when a button is clicked
+    file_stem = f"customer_support_tickets_filtered_{datetime.now().strftime('%Y%m%d')}"
+    
     st.download_button(
         label="📥 Download Filtered Data as CSV",
-        data=csv,
-        file_name=f"customer_support_tickets_filtered_{datetime.now().strftime('%Y%m%d')}.csv",
+        data=partial(to_csv_bytes, df_filtered),
+        file_name=f"{file_stem}.csv",
         mime="text/csv"
     )
+    st.download_button(
+        label="📥 Download Filtered Data as Parquet",
+        data=partial(to_parquet_bytes, df_filtered),
+        file_name=f"{file_stem}.parquet",
+        mime="application/vnd.apache.parquet"
+    )
 
 
 # ============================================================================
@@ -1,16 +1,127 @@
 """
 Utility functions for Customer Support Ticket Analysis
 """
+import io
+import os
+import warnings
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 from pathlib import Path
 import streamlit as st
 
 
-@st.cache_data
+CATEGORICAL_COLUMNS = (
+    "Ticket Priority",
+    "Ticket Channel",
+    "Ticket Status",
+    "Product Purchased",
+    "Ticket Type",
+)
+
+FILTER_COLUMNS = (
+    "Ticket Priority",
+    "Ticket Channel",
+    "Ticket Status",
+    "Product Purchased",
+)
+
+
+def _read_csv(csv_path):
+    """
+    Read the tickets CSV with PyArrow's multi-threaded CSV reader.
+    Timestamps are parsed during the read and the low-cardinality text
+    columns arrive dictionary-encoded, which pandas turns into categoricals.
+    
+    Args:
+        csv_path (Path): Path to the CSV file
+        
+    Returns:
+        pd.DataFrame: Raw customer support tickets data
+    """
+    table = pacsv.read_csv(
+        csv_path,
+        # Ticket descriptions contain quoted line breaks
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={
+                column: pa.dictionary(pa.int32(), pa.string())
+                for column in CATEGORICAL_COLUMNS
+            },
+            strings_can_be_null=True
+        )
+    )
+    return table.to_pandas(date_as_object=False)
+
+
+def _ensure_parquet(csv_path):
+    """
+    Convert the source CSV into a typed Parquet file the first time it is needed.
+    The Parquet copy is rebuilt whenever the CSV is newer than it.
+    
+    Args:
+        csv_path (Path): Path to the source CSV file
+        
+    Returns:
+        Path: Path to the Parquet file, or None if it could not be written
+    """
+    parquet_path = csv_path.with_suffix(".parquet")
+    
+    if parquet_path.exists() and (
+        not csv_path.exists() or
+        parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        return parquet_path
+    
+    df = _read_csv(csv_path)
+    
+    # Store typed columns so later loads skip string parsing
+    df["Customer Satisfaction Rating"] = pd.to_numeric(
+        df["Customer Satisfaction Rating"], 
+        errors="coerce"
+    )
+    for column in ("Date of Purchase", "First Response Time", "Time to Resolution"):
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    
+    # Write to a per-process temp file and swap it in atomically, so an
+    # interrupted or concurrent build never leaves a truncated cache behind
+    tmp_path = parquet_path.with_suffix(f".parquet.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", compression="snappy", index=False)
+        os.replace(tmp_path, parquet_path)
+    except OSError:
+        # Read-only deployments fall back to parsing the CSV directly
+        tmp_path.unlink(missing_ok=True)
+        return None
+    
+    return parquet_path
+
+
+def _read_parquet(parquet_path):
+    """
+    Read the Parquet cache, discarding it if it turns out to be unreadable.
+    
+    Args:
+        parquet_path (Path): Path to the Parquet file
+        
+    Returns:
+        pd.DataFrame: Cached tickets data, or None if the file was corrupt
+    """
+    try:
+        return pd.read_parquet(parquet_path, engine="pyarrow")
+    except (OSError, pa.ArrowException):
+        # Remove the broken file so the next load rebuilds it from the CSV
+        parquet_path.unlink(missing_ok=True)
+        return None
+
+
 def load_data():
     """
-    Load customer support tickets data from CSV file.
-    Uses Streamlit caching for performance.
+    Load customer support tickets data.
+    Reads a typed Parquet copy of the CSV file, creating it on first use.
+    Cached through load_and_clean(), so the raw frame isn't kept in memory.
     
     Returns:
         pd.DataFrame: Raw customer support tickets data
@@ -19,7 +130,10 @@ def load_data():
     csv_path = BASE_DIR / "data" / "customer_support_tickets.csv"
     
     try:
-        df = pd.read_csv(csv_path)
+        parquet_path = _ensure_parquet(csv_path)
+        df = _read_parquet(parquet_path) if parquet_path is not None else None
+        if df is None:
+            df = _read_csv(csv_path)
         return df
     except FileNotFoundError:
         st.error(f"❌ Data file not found at: {csv_path}")
@@ -29,6 +143,28 @@ def load_data():
         st.stop()
 
 
+def _resolution_hours(resolved, responded):
+    """
+    Calculate resolution durations in hours from raw datetime64 arrays.
+    Works on the NumPy buffers directly, so no intermediate Series are built.
+    
+    Args:
+        resolved (np.ndarray): Resolution timestamps (datetime64)
+        responded (np.ndarray): First response timestamps (datetime64)
+        
+    Returns:
+        np.ndarray: Float hours, NaN where either timestamp is missing
+            or the duration is not positive
+    """
+    # NaT propagates through the subtraction and divides to NaN
+    hours = (resolved - responded) / np.timedelta64(1, "h")
+    
+    # Filter out negative or zero values (data quality issues)
+    hours[hours <= 0] = np.nan
+    
+    return hours
+
+
 def clean_data(df):
     """
     Clean and prepare the data for analysis.
@@ -39,54 +175,207 @@ def clean_data(df):
     Returns:
         pd.DataFrame: Cleaned dataframe
     """
-    df_clean = df.copy()
+    # Parsed columns are collected here and attached in a single assign(),
+    # which avoids a full deep copy of the raw dataframe
+    parsed = {}
     
     # Convert satisfaction rating to numeric
-    df_clean["Customer Satisfaction Rating"] = pd.to_numeric(
-        df_clean["Customer Satisfaction Rating"], 
+    parsed["Customer Satisfaction Rating"] = pd.to_numeric(
+        df["Customer Satisfaction Rating"], 
         errors="coerce"
     )
     
     # Convert date columns to datetime
-    if "Date of Purchase" in df_clean.columns:
-        df_clean["Date of Purchase"] = pd.to_datetime(
-            df_clean["Date of Purchase"], 
+    if "Date of Purchase" in df.columns:
+        parsed["Date of Purchase"] = pd.to_datetime(
+            df["Date of Purchase"], 
             errors="coerce"
         )
     
     # Convert timestamp columns to datetime
-    if "First Response Time" in df_clean.columns:
-        df_clean["First Response Time"] = pd.to_datetime(
-            df_clean["First Response Time"], 
+    if "First Response Time" in df.columns:
+        parsed["First Response Time"] = pd.to_datetime(
+            df["First Response Time"], 
+            errors="coerce"
+        )
+    
+    # Time to Resolution is a timestamp, not numeric hours. Only parse it
+    # here; add_resolution_time() derives the duration from it
+    if "Time to Resolution" in df.columns:
+        parsed["Time to Resolution Timestamp"] = pd.to_datetime(
+            df["Time to Resolution"], 
             errors="coerce"
         )
     
+    df_clean = df.assign(**parsed)
+    
+    # Low-cardinality text columns become categoricals so filtering and
+    # grouping work on integer codes instead of Python strings
+    for column in CATEGORICAL_COLUMNS:
+        if column in df_clean.columns:
+            df_clean[column] = df_clean[column].astype("category")
+    
+    return df_clean
+
+
+def add_resolution_time(df):
+    """
+    Derive the resolution duration in hours from a cleaned dataframe.
+    Kept separate from clean_data so callers that never look at resolution
+    time don't pay for the datetime arithmetic.
+    
+    Args:
+        df (pd.DataFrame): Dataframe returned by clean_data
+        
+    Returns:
+        pd.DataFrame: Dataframe with "Time to Resolution" in hours
+    """
     # CRITICAL FIX: Time to Resolution is a timestamp, not numeric hours
     # We need to calculate the actual resolution duration
-    if "Time to Resolution" in df_clean.columns:
-        # Convert to datetime first
-        df_clean["Time to Resolution Timestamp"] = pd.to_datetime(
-            df_clean["Time to Resolution"], 
-            errors="coerce"
+    if "Time to Resolution Timestamp" not in df.columns:
+        return df
+    
+    # Calculate actual resolution time in hours
+    # Resolution Time = Time to Resolution - First Response Time
+    if "First Response Time" in df.columns:
+        resolution_hours = pd.Series(
+            _resolution_hours(
+                df["Time to Resolution Timestamp"].to_numpy(),
+                df["First Response Time"].to_numpy()
+            ),
+            index=df.index
         )
+    else:
+        # If no First Response Time, we can't calculate duration
+        resolution_hours = pd.NA
+    
+    return df.assign(**{"Time to Resolution": resolution_hours})
+
+
+@st.cache_resource
+def load_and_clean():
+    """
+    Load and clean the tickets data in one cached step.
+    Reruns triggered by widget interactions reuse the parsed dataframe
+    instead of repeating the numeric/datetime conversions.
+    
+    The dataframe is cached as a shared resource, so every rerun gets the same
+    object rather than a fresh copy. Callers must treat it as read-only.
+    
+    Resolution time is derived here too: the KPI row shows it on every
+    render, so computing it once at load is cheaper than per rerun.
+    
+    Returns:
+        pd.DataFrame: Cleaned customer support tickets data
+    """
+    return add_resolution_time(clean_data(load_data()))
+
+
+def get_filter_options(df):
+    """
+    Get the selectable values for each sidebar filter.
+    Categorical columns read their category list directly instead of
+    scanning every row for unique values.
+    
+    Args:
+        df (pd.DataFrame): Cleaned dataframe
         
-        # Calculate actual resolution time in hours
-        # Resolution Time = Time to Resolution - First Response Time
-        if "First Response Time" in df_clean.columns:
-            time_diff = (
-                df_clean["Time to Resolution Timestamp"] - 
-                df_clean["First Response Time"]
-            )
-            # Convert to hours and ensure positive values only
-            df_clean["Time to Resolution"] = time_diff.dt.total_seconds() / 3600
-            
-            # Filter out negative or zero values (data quality issues)
-            df_clean.loc[df_clean["Time to Resolution"] <= 0, "Time to Resolution"] = pd.NA
+    Returns:
+        dict: Column name -> sorted list of options
+    """
+    options = {}
+    for column in FILTER_COLUMNS:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            values = df[column].cat.categories.tolist()
         else:
-            # If no First Response Time, we can't calculate duration
-            df_clean["Time to Resolution"] = pd.NA
+            values = df[column].dropna().unique().tolist()
+        options[column] = sorted(values)
     
-    return df_clean
+    return options
+
+
+def _frame_key(df):
+    """
+    Cheap signature of a dataframe's rows, used to key the cached filter masks.
+    
+    Args:
+        df (pd.DataFrame): Dataframe being filtered
+        
+    Returns:
+        tuple: Row count and index checksum
+    """
+    return len(df), int(df.index.to_numpy().sum())
+
+
+def _selects_all(series, values):
+    """
+    Check whether a selection covers every value of a categorical column.
+    
+    Args:
+        series (pd.Series): Column being filtered
+        values (list): Selected values
+        
+    Returns:
+        bool: True if filtering on values would keep every row
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    
+    # Missing values never match a selection, so they must be absent too
+    return set(values) >= set(series.cat.categories) and not series.hasnans
+
+
+@st.cache_data(max_entries=64)
+def _isin_mask(_df, frame_key, column, values):
+    """
+    Build a boolean row mask for a categorical filter.
+    Cached per (frame, column, selection), so only the filter that changed
+    is recomputed on a rerun.
+    
+    Args:
+        _df (pd.DataFrame): Dataframe to filter (not hashed, see frame_key)
+        frame_key (tuple): Signature of _df from _frame_key()
+        column (str): Column to test
+        values (tuple): Selected values
+        
+    Returns:
+        np.ndarray: Boolean mask aligned with _df rows
+    """
+    series = _df[column]
+    
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+    
+    # Lookup table of selected categories indexed by category code, so the
+    # mask is a single gather over the codes with no string hashing.
+    # The extra trailing slot stays False and is hit by missing values (code -1)
+    categories = series.cat.categories
+    selected = np.zeros(len(categories) + 1, dtype=bool)
+    indexer = categories.get_indexer(list(values))
+    selected[indexer[indexer >= 0]] = True
+    
+    return selected[series.cat.codes.to_numpy()]
+
+
+@st.cache_data(max_entries=64)
+def _date_range_mask(_df, frame_key, start_date, end_date):
+    """
+    Build a boolean row mask for the purchase date range filter.
+    
+    Args:
+        _df (pd.DataFrame): Dataframe to filter (not hashed, see frame_key)
+        frame_key (tuple): Signature of _df from _frame_key()
+        start_date (date): First date to keep
+        end_date (date): Last date to keep
+        
+    Returns:
+        np.ndarray: Boolean mask aligned with _df rows
+    """
+    dates = _df["Date of Purchase"]
+    return (
+        (dates >= pd.Timestamp(start_date)) &
+        (dates <= pd.Timestamp(end_date))
+    ).to_numpy()
 
 
 def filter_data(df, date_range=None, priorities=None, channels=None, 
@@ -105,33 +394,54 @@ def filter_data(df, date_range=None, priorities=None, channels=None,
     Returns:
         pd.DataFrame: Filtered dataframe
     """
-    df_filtered = df.copy()
+    frame_key = _frame_key(df)
+    masks = []
     
     # Date filter
     if date_range and "Date of Purchase" in df.columns:
         start_date, end_date = date_range
-        df_filtered = df_filtered[
-            (df_filtered["Date of Purchase"] >= pd.Timestamp(start_date)) &
-            (df_filtered["Date of Purchase"] <= pd.Timestamp(end_date))
-        ]
+        masks.append(_date_range_mask(df, frame_key, start_date, end_date))
     
-    # Priority filter
-    if priorities and len(priorities) > 0:
-        df_filtered = df_filtered[df_filtered["Ticket Priority"].isin(priorities)]
+    # Priority, channel, status and product filters
+    selections = {
+        "Ticket Priority": priorities,
+        "Ticket Channel": channels,
+        "Ticket Status": statuses,
+        "Product Purchased": products,
+    }
+    for column, values in selections.items():
+        if values and len(values) > 0:
+            # Selecting every option (the sidebar default) keeps all rows
+            if _selects_all(df[column], values):
+                continue
+            # Sorted so the same set picked in another order hits the cache
+            masks.append(_isin_mask(df, frame_key, column, tuple(sorted(values))))
     
-    # Channel filter
-    if channels and len(channels) > 0:
-        df_filtered = df_filtered[df_filtered["Ticket Channel"].isin(channels)]
+    if not masks:
+        return df
     
-    # Status filter
-    if statuses and len(statuses) > 0:
-        df_filtered = df_filtered[df_filtered["Ticket Status"].isin(statuses)]
+    # Boolean indexing already returns a new frame, so no explicit copy
+    return df[np.logical_and.reduce(masks)]
+
+
+def _nanmean(series):
+    """
+    Average a numeric column, ignoring missing values.
+    Reduces the underlying NumPy array directly rather than going through
+    pandas' Series reduction machinery.
     
-    # Product filter
-    if products and len(products) > 0:
-        df_filtered = df_filtered[df_filtered["Product Purchased"].isin(products)]
+    Args:
+        series (pd.Series): Numeric column
+        
+    Returns:
+        float: Mean of the non-missing values, NaN if there are none
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
     
-    return df_filtered
+    # np.nanmean warns (and returns NaN) when every value is missing
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return float(np.nanmean(values))
 
 
 def calculate_kpis(df):
@@ -144,49 +454,168 @@ def calculate_kpis(df):
     Returns:
         dict: Dictionary of KPI values
     """
+    # One pass over the status column instead of a comparison per status
+    status_counts = df["Ticket Status"].value_counts(dropna=False)
+    
     kpis = {
         "total_tickets": len(df),
-        "avg_satisfaction": df["Customer Satisfaction Rating"].mean(),
-        "avg_resolution_time": df["Time to Resolution"].mean(),
-        "open_tickets": len(df[df["Ticket Status"] == "Open"]) if "Open" in df["Ticket Status"].values else 0,
-        "closed_tickets": len(df[df["Ticket Status"] == "Closed"]) if "Closed" in df["Ticket Status"].values else 0,
+        "avg_satisfaction": _nanmean(df["Customer Satisfaction Rating"]),
+        "avg_resolution_time": _nanmean(df["Time to Resolution"]),
+        "open_tickets": int(status_counts.get("Open", 0)),
+        "closed_tickets": int(status_counts.get("Closed", 0)),
     }
     
     return kpis
 
 
-def get_satisfaction_by_group(df, group_column):
+def _categorical_group_mean_count(df, group_column, value_columns):
     """
-    Calculate average satisfaction rating grouped by a column.
+    Per-group mean and count for a categorical key, computed from its codes.
+    Each value column takes one np.bincount pass over the integer codes,
+    with no sorting or hashing of the keys.
     
     Args:
         df (pd.DataFrame): Dataframe to analyze
-        group_column (str): Column name to group by
+        group_column (str): Categorical column to group by
+        value_columns (list): Numeric columns to summarise
         
     Returns:
-        pd.DataFrame: Grouped satisfaction data
+        pd.DataFrame: One row per group (missing key last), with the group
+            column plus "<column>_mean" and "<column>_count" per value column
     """
-    # Filter out rows with missing satisfaction ratings
-    df_valid = df[df["Customer Satisfaction Rating"].notna()]
+    keys = df[group_column]
+    n_categories = len(keys.cat.categories)
+    
+    # Missing keys (code -1) get their own slot after the real categories
+    codes = keys.cat.codes.to_numpy()
+    codes = np.where(codes < 0, n_categories, codes)
+    
+    grouped = {
+        group_column: pd.Categorical.from_codes(
+            np.append(np.arange(n_categories), -1), 
+            dtype=keys.dtype
+        )
+    }
+    for value_column in value_columns:
+        values = df[value_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=n_categories + 1)
+        counts = np.bincount(codes[valid], minlength=n_categories + 1)
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            grouped[f"{value_column}_mean"] = sums / counts
+        grouped[f"{value_column}_count"] = counts
     
-    if len(df_valid) == 0:
-        return pd.DataFrame()
+    return pd.DataFrame(grouped)
+
+
+def _arrow_group_mean_count(df, group_column, value_columns):
+    """
+    Per-group mean and count for any key, using PyArrow's hash aggregation.
     
-    grouped = (
-        df_valid.groupby(group_column, dropna=False)["Customer Satisfaction Rating"]
-        .agg(["mean", "count"])
-        .reset_index()
-        .sort_values("mean", ascending=False)
+    Args:
+        df (pd.DataFrame): Dataframe to analyze
+        group_column (str): Column name to group by
+        value_columns (list): Numeric columns to summarise
+        
+    Returns:
+        pd.DataFrame: One row per group, with the group column plus
+            "<column>_mean" and "<column>_count" per value column
+    """
+    # NaN becomes null on conversion, and Arrow's mean/count skip nulls
+    table = pa.Table.from_pandas(
+        df[[group_column, *value_columns]], 
+        preserve_index=False
     )
+    return (
+        table.group_by(group_column)
+        .aggregate(
+            [(column, "mean") for column in value_columns] +
+            [(column, "count") for column in value_columns]
+        )
+        .to_pandas()
+    )
+
+
+def _group_mean_count(df, group_column, value_columns):
+    """
+    Calculate the mean and count of several value columns in one grouping pass.
+    Categorical keys are aggregated directly from their integer codes;
+    other keys go through PyArrow's hash aggregation.
     
-    grouped.columns = [group_column, "Average Satisfaction", "Count"]
+    Args:
+        df (pd.DataFrame): Dataframe to analyze
+        group_column (str): Column name to group by
+        value_columns (list): Numeric columns to summarise
+        
+    Returns:
+        dict: Value column name -> pd.DataFrame with the group column,
+            "mean" and "count", limited to groups with at least one value
+    """
+    if isinstance(df[group_column].dtype, pd.CategoricalDtype):
+        grouped = _categorical_group_mean_count(df, group_column, value_columns)
+    else:
+        grouped = _arrow_group_mean_count(df, group_column, value_columns)
+    
+    stats = {}
+    for value_column in value_columns:
+        summary = pd.DataFrame({
+            group_column: grouped[group_column],
+            "mean": grouped[f"{value_column}_mean"],
+            "count": grouped[f"{value_column}_count"],
+        })
+        stats[value_column] = summary[summary["count"] > 0]
+    
+    return stats
+
+
+def _format_group_stats(stats, group_column, mean_label, ascending):
+    """
+    Sort and label grouped mean/count statistics for charting.
+    
+    Args:
+        stats (pd.DataFrame): Output of _group_mean_count for one value column
+        group_column (str): Column name the data was grouped by
+        mean_label (str): Display name for the mean column
+        ascending (bool): Sort order of the mean
+        
+    Returns:
+        pd.DataFrame: Grouped data with columns [group_column, mean_label, "Count"]
+    """
+    grouped = stats.sort_values("mean", ascending=ascending)
+    grouped.columns = [group_column, mean_label, "Count"]
     
     return grouped
 
 
+def get_satisfaction_by_group(df, group_column):
+    """
+    Calculate average satisfaction rating grouped by a column.
+    
+    Args:
+        df (pd.DataFrame): Dataframe to analyze
+        group_column (str): Column name to group by
+        
+    Returns:
+        pd.DataFrame: Grouped satisfaction data
+    """
+    # Missing ratings are skipped by the mean/count aggregation
+    stats = _group_mean_count(df, group_column, ["Customer Satisfaction Rating"])
+    
+    return _format_group_stats(
+        stats["Customer Satisfaction Rating"],
+        group_column,
+        "Average Satisfaction",
+        ascending=False
+    )
+
+
 def get_resolution_by_group(df, group_column):
     """
     Calculate average resolution time grouped by a column.
+    Expects a dataframe that has been through add_resolution_time(); a bare
+    clean_data() result has no "Time to Resolution" hours column.
     
     Args:
         df (pd.DataFrame): Dataframe to analyze
@@ -195,44 +624,143 @@ def get_resolution_by_group(df, group_column):
     Returns:
         pd.DataFrame: Grouped resolution time data
     """
-    # Filter out rows with missing or zero resolution times
-    df_valid = df[
-        df["Time to Resolution"].notna() & 
-        (df["Time to Resolution"] > 0)
-    ]
-    
-    if len(df_valid) == 0:
-        return pd.DataFrame()
+    # add_resolution_time() already sets zero/negative resolution times to
+    # missing, and missing values are skipped by the mean/count aggregation
+    stats = _group_mean_count(df, group_column, ["Time to Resolution"])
     
-    grouped = (
-        df_valid.groupby(group_column, dropna=False)["Time to Resolution"]
-        .agg(["mean", "count"])
-        .reset_index()
-        .sort_values("mean", ascending=True)
+    return _format_group_stats(
+        stats["Time to Resolution"],
+        group_column,
+        "Average Resolution Time",
+        ascending=True
     )
-    
-    grouped.columns = [group_column, "Average Resolution Time", "Count"]
-    
-    return grouped
 
 
-def get_volume_by_group(df, group_column):
+def get_volume_by_group(df, group_column, top_n=15):
     """
     Calculate ticket volume grouped by a column.
+    Groups beyond the top_n largest are combined into a single "Other" row,
+    which keeps charts of long-tailed columns readable and light to render.
     
     Args:
         df (pd.DataFrame): Dataframe to analyze
         group_column (str): Column name to group by
+        top_n (int): Maximum number of groups to keep (None keeps all)
         
     Returns:
         pd.DataFrame: Grouped volume data
     """
-    volume = (
-        df[group_column]
-        .value_counts(dropna=False)
-        .reset_index()
-    )
+    volume = df[group_column].value_counts(dropna=False)
+    
+    # Categorical columns report unused categories with a zero count
+    volume = volume[volume > 0].reset_index()
     
     volume.columns = [group_column, "Count"]
     
+    if top_n is not None and len(volume) > top_n:
+        other = pd.DataFrame({
+            group_column: ["Other"],
+            "Count": [volume["Count"].iloc[top_n:].sum()]
+        })
+        volume = pd.concat(
+            [volume.iloc[:top_n].astype({group_column: object}), other],
+            ignore_index=True
+        )
+    
     return volume
+
+
+def sample_by_group(df, group_column, max_points=1500, random_state=0):
+    """
+    Downsample a dataframe for plotting using a stratified random sample.
+    Each group keeps its share of rows, so the chart's distribution is preserved.
+    
+    Args:
+        df (pd.DataFrame): Dataframe to sample
+        group_column (str): Column to stratify by
+        max_points (int): Approximate maximum number of rows to keep
+        random_state (int): Seed so the sample is stable across reruns
+        
+    Returns:
+        pd.DataFrame: Sampled dataframe (unchanged if already small enough)
+    """
+    if len(df) <= max_points:
+        return df
+    
+    return (
+        df.groupby(group_column, dropna=False, observed=True)
+        .sample(frac=max_points / len(df), random_state=random_state)
+    )
+
+
+@st.cache_data(max_entries=32)
+def compute_all_aggregates(_df, filter_key):
+    """
+    Compute every grouped dataset the dashboard charts from the filtered data.
+    Columns used by several charts are grouped once, and the result is cached
+    per filter selection.
+    
+    Args:
+        _df (pd.DataFrame): Filtered dataframe that has been through
+            add_resolution_time() (not hashed, see filter_key)
+        filter_key (tuple): The filter selections that produced _df
+        
+    Returns:
+        dict: Chart name -> grouped pd.DataFrame
+    """
+    satisfaction = "Customer Satisfaction Rating"
+    resolution = "Time to Resolution"
+    
+    by_type = _group_mean_count(_df, "Ticket Type", [satisfaction])
+    by_priority = _group_mean_count(_df, "Ticket Priority", [satisfaction, resolution])
+    by_channel = _group_mean_count(_df, "Ticket Channel", [satisfaction])
+    
+    return {
+        "sat_by_type": _format_group_stats(
+            by_type[satisfaction], "Ticket Type", "Average Satisfaction", ascending=False
+        ),
+        "sat_by_priority": _format_group_stats(
+            by_priority[satisfaction], "Ticket Priority", "Average Satisfaction", ascending=False
+        ),
+        "sat_by_channel": _format_group_stats(
+            by_channel[satisfaction], "Ticket Channel", "Average Satisfaction", ascending=False
+        ),
+        "res_by_priority": _format_group_stats(
+            by_priority[resolution], "Ticket Priority", "Average Resolution Time", ascending=True
+        ),
+        "vol_by_channel": get_volume_by_group(_df, "Ticket Channel"),
+        "vol_by_status": get_volume_by_group(_df, "Ticket Status"),
+    }
+
+
+def to_csv_bytes(df):
+    """
+    Serialise a dataframe to CSV for download.
+    Rows are written in chunks straight into a byte buffer instead of
+    building the whole file as one Python string first.
+    
+    Args:
+        df (pd.DataFrame): Dataframe to export
+        
+    Returns:
+        bytes: UTF-8 encoded CSV data
+    """
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, chunksize=10_000)
+    return buffer.getvalue()
+
+
+def to_parquet_bytes(df):
+    """
+    Serialise a dataframe to Parquet for download.
+    Keeps column types and is much smaller than the equivalent CSV.
+    
+    Args:
+        df (pd.DataFrame): Dataframe to export
+        
+    Returns:
+        bytes: Snappy-compressed Parquet data
+    """
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, engine="pyarrow", compression="snappy", index=False)
+    return buffer.getvalue()